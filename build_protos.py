@@ -17,33 +17,33 @@ def compile_protos():
         print("No .proto files found to compile")
         return True
 
-    for proto_file in proto_files:
-        print(f"Compiling {proto_file}...")
-        try:
-            subprocess.run(
-                ["protoc", f"--python_out=.", str(proto_file)],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-            print(f"Successfully compiled {proto_file}")
-        except subprocess.CalledProcessError as e:
-            print(f"Error compiling {proto_file}: {e.stderr}", file=sys.stderr)
-            return False
-        except FileNotFoundError:
-            print(
-                "Warning: protoc not found. Skipping proto compilation.",
-                file=sys.stderr,
-            )
-            print(
-                "  To compile protos, install protobuf compiler:",
-                file=sys.stderr,
-            )
-            print("    macOS: brew install protobuf", file=sys.stderr)
-            print(
-                "    Ubuntu: apt-get install protobuf-compiler", file=sys.stderr
-            )
-            return True  # Don't fail the build, just warn
+    # Compile all files with a single protoc invocation to avoid paying the
+    # process startup cost once per file.
+    proto_paths = [str(p) for p in proto_files]
+    print(f"Compiling {', '.join(proto_paths)}...")
+    try:
+        subprocess.run(
+            ["protoc", f"--python_out=."] + proto_paths,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        print(f"Successfully compiled {len(proto_paths)} proto files")
+    except subprocess.CalledProcessError as e:
+        print(f"Error compiling proto files: {e.stderr}", file=sys.stderr)
+        return False
+    except FileNotFoundError:
+        print(
+            "Warning: protoc not found. Skipping proto compilation.",
+            file=sys.stderr,
+        )
+        print(
+            "  To compile protos, install protobuf compiler:",
+            file=sys.stderr,
+        )
+        print("    macOS: brew install protobuf", file=sys.stderr)
+        print("    Ubuntu: apt-get install protobuf-compiler", file=sys.stderr)
+        return True  # Don't fail the build, just warn
 
     return True
 
@@ -16,6 +16,16 @@ Options:
     -U, --user       Database user (default: postgres)
     -W, --password   Database password (default: empty)
     -t, --tables     Specific tables to import (default: all)
+    -j, --jobs       Number of concurrent imports (default: min(files, CPUs))
+    --bulk           Disable synchronous commit/FK checks and rebuild indexes
+                     after load
+    --chunk-rows     Rows per COPY (default: 200000 for files >= 256 MiB,
+                     0 disables)
+    --binary         Convert rows to binary COPY format on the client
+    --commit-every   Commit after this many files per connection
+                     (default: once at the end)
+    --server-side    Have the server read the CSV files from its own
+                     filesystem (requires pg_read_server_files)
 
 Example:
     python import_csv.py /tmp/db-fork/tpcc-3 -U elaineang
@@ -23,91 +33,684 @@ Example:
 """
 
 import argparse
+import csv
+import io
+import os
+import queue
+import struct
+import threading
 import psycopg2
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Size of the chunks handed to libpq for each COPY data message.
+COPY_BUFFER_SIZE = 1 << 20
+# Files at least this large are imported as several COPYs of
+# DEFAULT_CHUNK_ROWS rows each, unless chunking is configured explicitly.
+LARGE_CSV_BYTES = 256 << 20
+DEFAULT_CHUNK_ROWS = 200_000
+
+# Epoch of Postgres binary date/timestamp values.
+PG_EPOCH_DATE = date(2000, 1, 1)
+PG_EPOCH_DATETIME = datetime(2000, 1, 1)
+# Header and trailer of the Postgres binary COPY format.
+BINARY_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+BINARY_COPY_TRAILER = struct.pack("!h", -1)
+
 
 def get_csv_files(directory: str) -> list[Path]:
-    """Get all CSV files from the given directory."""
+    """Get all CSV files from the given directory, in no particular order."""
     csv_dir = Path(directory)
     if not csv_dir.exists():
         raise ValueError(f"Directory does not exist: {directory}")
 
-    csv_files = sorted(csv_dir.glob("*.csv"))
+    csv_files = [
+        p for p in csv_dir.iterdir() if p.suffix == ".csv" and p.is_file()
+    ]
     if not csv_files:
         raise ValueError(f"No CSV files found in: {directory}")
 
     return csv_files
 
 
-def import_csv_file(conn, csv_path: Path, table_name: str) -> int:
+# Number of times each prepared statement was run, keyed by (connection,
+# backend PID, name).
+_STATEMENT_USES = {}
+
+# Per-table metadata queries run on every import, by prepared statement name.
+_SECONDARY_INDEXES_SQL = """
+    SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+    FROM pg_index i
+    WHERE i.indrelid = %s::regclass
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid
+    )
+"""
+_COLUMN_TYPES_SQL = """
+    SELECT column_name, udt_name
+    FROM information_schema.columns
+    WHERE table_name = %s
+    ORDER BY ordinal_position
+"""
+
+
+def _execute_prepared(cur, name: str, statement: str, params: tuple) -> None:
+    """
+    Executes a statement that takes one text parameter per %s placeholder.
+    Most connections import a single file and run the statement once, so it
+    is only prepared on the server the second time it is used on a
+    connection. Later calls skip parsing and planning.
+    """
+    conn = cur.connection
+    key = (id(conn), conn.get_backend_pid(), name)
+    uses = _STATEMENT_USES.get(key, 0)
+    _STATEMENT_USES[key] = uses + 1
+    if uses == 0:
+        cur.execute(statement, params)
+        return
+
+    placeholders = ", ".join(["%s"] * len(params))
+    execute = f"EXECUTE {name}({placeholders});"
+    if uses == 1:
+        # Prepare and execute in the same round-trip.
+        param_types = ", ".join(["text"] * len(params))
+        parts = statement.split("%s")
+        body = parts[0] + "".join(
+            f"${i}{part}" for i, part in enumerate(parts[1:], 1)
+        )
+        execute = f"PREPARE {name}({param_types}) AS {body};\n{execute}"
+    cur.execute(execute, params)
+
+
+def _forget_prepared_statements(conn) -> None:
+    """Drops the prepared statement bookkeeping of a closed connection."""
+    conn_id = id(conn)
+    for key in [key for key in _STATEMENT_USES if key[0] == conn_id]:
+        del _STATEMENT_USES[key]
+
+
+def _drop_secondary_indexes(cur, table_name: str) -> list[str]:
+    """
+    Drop all indexes on a table that don't back a constraint (primary key,
+    unique, exclusion).
+
+    Returns the CREATE INDEX statements needed to restore them.
+    """
+    _execute_prepared(
+        cur, "secondary_indexes", _SECONDARY_INDEXES_SQL, (f'"{table_name}"',)
+    )
+    indexes = cur.fetchall()
+    for index_name, _ in indexes:
+        cur.execute(f"DROP INDEX {index_name};")
+    return [index_def for _, index_def in indexes]
+
+
+def _put_unless_stopped(
+    chunks: queue.Queue, item, stop: threading.Event
+) -> bool:
+    """Puts an item on the queue, giving up if the consumer has stopped."""
+    while not stop.is_set():
+        try:
+            chunks.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_csv_chunks(
+    csv_path: Path, chunk_rows: int, chunks: queue.Queue, stop: threading.Event
+) -> None:
+    """
+    Reads a CSV file into in-memory buffers of chunk_rows records each and
+    puts them on the queue, followed by None. Errors are put on the queue too.
+
+    Newlines inside quoted fields don't end a record, so chunks never split a
+    record in two.
+    """
+    try:
+        with open(csv_path, "rb") as f:
+            buf = io.BytesIO()
+            num_rows = 0
+            in_quotes = False
+            for line in f:
+                buf.write(line)
+                # An odd number of quotes toggles whether the record continues
+                # on the next line. Escaped quotes ("") don't change parity.
+                if line.count(b'"') % 2:
+                    in_quotes = not in_quotes
+                if in_quotes:
+                    continue
+                num_rows += 1
+                if num_rows >= chunk_rows:
+                    buf.seek(0)
+                    if not _put_unless_stopped(chunks, buf, stop):
+                        return
+                    buf = io.BytesIO()
+                    num_rows = 0
+            if buf.tell():
+                buf.seek(0)
+                if not _put_unless_stopped(chunks, buf, stop):
+                    return
+        _put_unless_stopped(chunks, None, stop)
+    except Exception as e:
+        _put_unless_stopped(chunks, e, stop)
+
+
+def _iter_csv_chunks(csv_path: Path, chunk_rows: int):
+    """
+    Yields buffers of chunk_rows CSV records each. The file is read on a
+    background thread, at most two chunks ahead, so reading the next chunk
+    overlaps with sending the current one.
+    """
+    chunks = queue.Queue(maxsize=2)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_read_csv_chunks,
+        args=(csv_path, chunk_rows, chunks, stop),
+        daemon=True,
+    )
+    reader.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        stop.set()
+        reader.join()
+
+
+def _encode_numeric(value: str) -> bytes:
+    """Encodes a decimal string in the Postgres binary numeric format."""
+    d = Decimal(value)
+    if d.is_nan():
+        return struct.pack("!hhHH", 0, 0, 0xC000, 0)
+    if d.is_infinite():
+        raise ValueError(f"Unsupported numeric value: {value}")
+
+    sign, digits, exp = d.as_tuple()
+    dscale = max(0, -exp)
+    digit_str = "".join(map(str, digits))
+    if exp > 0:
+        digit_str += "0" * exp
+        exp = 0
+
+    # Split into integer and fraction digits, padded to base-10000 groups.
+    int_len = len(digit_str) + exp
+    if int_len > 0:
+        int_part, frac_part = digit_str[:int_len], digit_str[int_len:]
+    else:
+        int_part, frac_part = "", "0" * -int_len + digit_str
+    int_part = int_part.zfill(-(-len(int_part) // 4) * 4)
+    frac_part = frac_part.ljust(-(-len(frac_part) // 4) * 4, "0")
+    groups = [int(int_part[i : i + 4]) for i in range(0, len(int_part), 4)]
+    groups += [int(frac_part[i : i + 4]) for i in range(0, len(frac_part), 4)]
+
+    # Weight is the power of 10000 of the first group.
+    weight = len(int_part) // 4 - 1
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    return struct.pack(
+        f"!hhHH{len(groups)}H",
+        len(groups),
+        weight,
+        0x4000 if sign else 0,
+        dscale,
+        *groups,
+    )
+
+
+def _encode_bool(value: str) -> bytes:
+    truthy = value.lower() in ("t", "true", "y", "yes", "on", "1")
+    return b"\x01" if truthy else b"\x00"
+
+
+def _encode_timestamp(value: str) -> bytes:
+    micros = (datetime.fromisoformat(value) - PG_EPOCH_DATETIME) // timedelta(
+        microseconds=1
+    )
+    return struct.pack("!q", micros)
+
+
+def _encode_date(value: str) -> bytes:
+    return struct.pack("!i", (date.fromisoformat(value) - PG_EPOCH_DATE).days)
+
+
+def _fixed_field(fmt: str, convert):
+    """
+    Returns an encoder for a fixed-size type that packs the field length and
+    the converted value with one precompiled struct.
+    """
+    packer = struct.Struct("!i" + fmt)
+    size = packer.size - 4
+    return lambda v: packer.pack(size, convert(v))
+
+
+def _varlen_field(encode):
+    """
+    Returns an encoder that prefixes the output of encode with its length.
+    """
+    return lambda v: _FIELD_LENGTH.pack(len(data := encode(v))) + data
+
+
+_FIELD_LENGTH = struct.Struct("!i")
+
+# Encoders from CSV text to length-prefixed Postgres binary fields, keyed by
+# udt_name.
+_BINARY_ENCODERS = {
+    "int2": _fixed_field("h", int),
+    "int4": _fixed_field("i", int),
+    "int8": _fixed_field("q", int),
+    "float4": _fixed_field("f", float),
+    "float8": _fixed_field("d", float),
+    "numeric": _varlen_field(_encode_numeric),
+    "bool": _varlen_field(_encode_bool),
+    "date": _varlen_field(_encode_date),
+    "timestamp": _varlen_field(_encode_timestamp),
+    "text": _varlen_field(str.encode),
+    "varchar": _varlen_field(str.encode),
+    "bpchar": _varlen_field(str.encode),
+}
+
+
+def _get_binary_encoders(cur, table_name: str) -> list:
+    """
+    Returns the binary encoder of each column of a table, in column order.
+
+    Raises ValueError if a column type has no binary encoder.
+    """
+    _execute_prepared(cur, "column_types", _COLUMN_TYPES_SQL, (table_name,))
+    encoders = []
+    for column_name, udt_name in cur.fetchall():
+        if udt_name not in _BINARY_ENCODERS:
+            raise ValueError(
+                f"No binary encoding for column {column_name} ({udt_name})"
+            )
+        encoders.append(_BINARY_ENCODERS[udt_name])
+    return encoders
+
+
+def _iter_binary_copy_data(csv_path: Path, encoders: list):
+    """
+    Converts a CSV file into the Postgres binary COPY format, yielding chunks
+    of about COPY_BUFFER_SIZE bytes.
+
+    Raises ValueError if a row doesn't have one field per column.
+    """
+    expected_fields = len(encoders)
+    num_fields = struct.pack("!h", expected_fields)
+    null_field = _FIELD_LENGTH.pack(-1)
+    buf = bytearray(BINARY_COPY_HEADER)
+    join = b"".join
+    with open(csv_path, "r", newline="") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if len(row) != expected_fields:
+                raise ValueError(
+                    f"{csv_path}, line {reader.line_num}: expected "
+                    f"{expected_fields} fields, got {len(row)}"
+                )
+            buf += num_fields
+            buf += join(
+                [
+                    null_field if value == "null" else encode(value)
+                    for value, encode in zip(row, encoders)
+                ]
+            )
+            if len(buf) >= COPY_BUFFER_SIZE:
+                yield bytes(buf)
+                buf.clear()
+    buf += BINARY_COPY_TRAILER
+    yield bytes(buf)
+
+
+class _IterReader:
+    """Minimal file-like object over an iterator of bytes, for copy_expert."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buf = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buf) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buf += chunk
+        if size < 0:
+            size = len(self._buf)
+        data = bytes(self._buf[:size])
+        del self._buf[:size]
+        return data
+
+
+def _copy_from_server_file(cur, csv_path: Path, table_name: str):
+    """
+    Has the server read the CSV file directly from its own filesystem, which
+    skips sending the data through the client. This needs the file to be
+    visible to the server at the same path, and the pg_read_server_files role.
+
+    Returns the number of rows imported, or None if the server couldn't read
+    the file.
+    """
+    cur.execute("SAVEPOINT server_copy;")
+    try:
+        cur.execute(
+            f'COPY "{table_name}" FROM %s '
+            f"WITH (FORMAT CSV, NULL 'null', DELIMITER ',');",
+            (str(csv_path.resolve()),),
+        )
+    except psycopg2.Error as e:
+        cur.execute("ROLLBACK TO SAVEPOINT server_copy;")
+        print(f"Server-side COPY failed for {table_name}, sending file: {e}")
+        return None
+    rows = cur.rowcount
+    cur.execute("RELEASE SAVEPOINT server_copy;")
+    return rows
+
+
+def _copy_from_client(
+    cur, csv_path: Path, table_name: str, chunk_rows: int, use_binary: bool
+) -> int:
+    """
+    Sends a CSV file to the server with COPY FROM STDIN, as described in
+    import_csv_file.
+
+    Returns the number of rows imported.
+    """
+    if chunk_rows is None and csv_path.stat().st_size >= LARGE_CSV_BYTES:
+        chunk_rows = DEFAULT_CHUNK_ROWS
+
+    encoders = None
+    if use_binary:
+        try:
+            encoders = _get_binary_encoders(cur, table_name)
+        except ValueError as e:
+            print(f"Falling back to CSV COPY for {table_name}: {e}")
+
+    # Use COPY command for fast bulk import. psycopg2 sets rowcount from the
+    # COPY command tag.
+    if encoders:
+        cur.copy_expert(
+            f'COPY "{table_name}" FROM STDIN WITH (FORMAT BINARY);',
+            _IterReader(_iter_binary_copy_data(csv_path, encoders)),
+            size=COPY_BUFFER_SIZE,
+        )
+        return cur.rowcount
+
+    # Quote the table name for reserved words like 'order'. No header row in
+    # these CSV files.
+    copy_sql = (
+        f'COPY "{table_name}" FROM STDIN '
+        f"WITH (FORMAT CSV, NULL 'null', DELIMITER ',');"
+    )
+    if chunk_rows:
+        rows = 0
+        for chunk in _iter_csv_chunks(csv_path, chunk_rows):
+            cur.copy_expert(copy_sql, chunk, size=COPY_BUFFER_SIZE)
+            rows += cur.rowcount
+        return rows
+
+    with open(csv_path, "rb", buffering=COPY_BUFFER_SIZE) as f:
+        cur.copy_expert(copy_sql, f, size=COPY_BUFFER_SIZE)
+    return cur.rowcount
+
+
+def import_csv_file(
+    conn,
+    csv_path: Path,
+    table_name: str,
+    rebuild_indexes: bool = False,
+    chunk_rows: int = None,
+    use_binary: bool = False,
+    server_side: bool = False,
+) -> int:
     """
     Import a single CSV file into the database table using COPY.
 
+    The file is streamed to the server in binary mode in large chunks, and the
+    number of imported rows is taken from the COPY command status instead of
+    counting the table before and after the import.
+
+    If rebuild_indexes is set, secondary indexes are dropped before the COPY
+    and recreated after it in the same transaction, so rows are loaded without
+    per-row index maintenance.
+
+    If chunk_rows is set, the file is sent as one COPY per chunk_rows records
+    in the same transaction, which bounds the size of each COPY. By default
+    only files of at least LARGE_CSV_BYTES are chunked; pass 0 to disable.
+
+    If use_binary is set, rows are converted to the Postgres binary COPY
+    format on the client, which saves the server from parsing each field.
+    This falls back to a CSV COPY if the table has a column type without a
+    binary encoder. Binary imports are always sent as a single COPY.
+
+    If server_side is set, the server is asked to read the file from its own
+    filesystem first (e.g. a local server or a shared mount), falling back to
+    sending the file if that fails.
+
+    The import is not committed; that is left to the caller.
+
     Returns the number of rows imported.
     """
     with conn.cursor() as cur:
-        # Get row count before import (quote table name for reserved words like 'order')
-        cur.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-        before_count = cur.fetchone()[0]
-
-        # Use COPY command for fast bulk import
-        with open(csv_path, "r") as f:
-            # No header row in these CSV files
-            cur.copy_expert(
-                f'COPY "{table_name}" FROM STDIN '
-                f"WITH (FORMAT CSV, NULL 'null', DELIMITER ',');",
-                f,
+        index_defs = []
+        if rebuild_indexes:
+            index_defs = _drop_secondary_indexes(cur, table_name)
+
+        rows = None
+        if server_side:
+            rows = _copy_from_server_file(cur, csv_path, table_name)
+        if rows is None:
+            rows = _copy_from_client(
+                cur, csv_path, table_name, chunk_rows, use_binary
             )
 
-        # Get row count after import
-        cur.execute(f'SELECT COUNT(*) FROM "{table_name}"')
-        after_count = cur.fetchone()[0]
+        for index_def in index_defs:
+            cur.execute(index_def)
+
+    return rows
 
-        conn.commit()
 
-        return after_count - before_count
+def _prepare_bulk_session(conn) -> None:
+    """
+    Configure a connection for bulk loading: don't wait for WAL flushes on
+    commit, and skip foreign key triggers.
+
+    Disabling triggers requires superuser, so that part is best effort.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SET synchronous_commit = OFF;")
+    conn.commit()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET session_replication_role = 'replica';")
+        conn.commit()
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"Warning: foreign key checks stay enabled: {e}")
 
 
 def import_all_csvs(
-    connection_uri: str, csv_directory: str, tables: list[str] = None
+    connection_uri: str,
+    csv_directory: str,
+    tables: list[str] = None,
+    workers: int = None,
+    bulk_mode: bool = False,
+    chunk_rows: int = None,
+    use_binary: bool = False,
+    commit_every: int = None,
+    server_side: bool = False,
 ) -> dict:
     """
     Import all CSV files from a directory into the database.
 
+    Files are imported concurrently, one COPY per table, by a pool of worker
+    threads that each own a separate connection. Files are scheduled largest
+    first to balance the workers. Each connection imports its
+    files in a single transaction that is committed once at the end, or every
+    commit_every files. Every file is imported under a savepoint, so a failed
+    file only rolls back its own rows.
+
     Args:
         connection_uri: PostgreSQL connection URI
         csv_directory: Directory containing CSV files
         tables: Optional list of specific tables to import. If None, imports all.
+        workers: Number of concurrent imports. Defaults to
+            min(number of files, CPU count).
+        bulk_mode: If True, turn off synchronous commit and foreign key
+            checks on the import connections and rebuild secondary indexes
+            after each COPY instead of maintaining them per row.
+        chunk_rows: Number of records per COPY for each file. See
+            import_csv_file for the default.
+        use_binary: If True, send rows in the Postgres binary COPY format
+            where the column types allow it.
+        commit_every: If set, commit each connection after this many files
+            instead of only once at the end.
+        server_side: If True, try to have the server read the CSV files
+            directly from its filesystem.
 
     Returns:
         Dict mapping table names to number of rows imported.
     """
-    csv_files = get_csv_files(csv_directory)
+    # Start the largest files first so that a big table doesn't end up
+    # running alone at the end while the other workers are idle.
+    csv_files = sorted(
+        get_csv_files(csv_directory),
+        key=lambda p: p.stat().st_size,
+        reverse=True,
+    )
     results = {}
 
-    conn = psycopg2.connect(connection_uri)
+    tasks = []
+    for csv_path in csv_files:
+        table_name = csv_path.stem  # filename without extension
+
+        # Skip if not in specified tables list
+        if tables and table_name not in tables:
+            print(f"Skipping {table_name} (not in tables list)")
+            continue
+        tasks.append((csv_path, table_name))
+
+    if not tasks:
+        return results
+
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+
+    # Each worker thread lazily opens and keeps its own connection, along
+    # with the tables imported on it since its last commit.
+    local = threading.local()
+    conns = []
+    # Imported tables that were lost to a failed commit or rollback.
+    lost = []
+    lock = threading.Lock()
+
+    def get_conn():
+        # A connection that dropped is replaced, its uncommitted tables have
+        # already been recorded as lost.
+        if getattr(local, "conn", None) is None or local.conn.closed:
+            conn = psycopg2.connect(connection_uri)
+            if bulk_mode:
+                try:
+                    _prepare_bulk_session(conn)
+                except Exception:
+                    conn.close()
+                    raise
+            local.conn = conn
+            local.uncommitted = []
+            with lock:
+                conns.append((conn, local.uncommitted))
+        return local.conn, local.uncommitted
+
+    def rollback(conn) -> None:
+        try:
+            conn.rollback()
+        except Exception:
+            # The connection is gone, and its transaction with it.
+            pass
+
+    def commit(conn, uncommitted: list[str]) -> None:
+        try:
+            conn.commit()
+        except Exception as e:
+            rollback(conn)
+            with lock:
+                lost.extend((table_name, e) for table_name in uncommitted)
+        uncommitted.clear()
+
+    def run_import(csv_path: Path, table_name: str):
+        try:
+            conn, uncommitted = get_conn()
+        except Exception as e:
+            # Report it like any other failed file, so that it doesn't abort
+            # the imports running on the other workers.
+            return table_name, e
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SAVEPOINT import_file;")
+                rows = import_csv_file(
+                    conn,
+                    csv_path,
+                    table_name,
+                    rebuild_indexes=bulk_mode,
+                    chunk_rows=chunk_rows,
+                    use_binary=use_binary,
+                    server_side=server_side,
+                )
+                cur.execute("RELEASE SAVEPOINT import_file;")
+        except Exception as e:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("ROLLBACK TO SAVEPOINT import_file;")
+            except Exception as rollback_error:
+                # The whole transaction is gone, including earlier files.
+                rollback(conn)
+                with lock:
+                    lost.extend((t, rollback_error) for t in uncommitted)
+                uncommitted.clear()
+            return table_name, e
+
+        uncommitted.append(table_name)
+        if commit_every and len(uncommitted) >= commit_every:
+            commit(conn, uncommitted)
+        return table_name, rows
 
     try:
-        for csv_path in csv_files:
-            table_name = csv_path.stem  # filename without extension
-
-            # Skip if not in specified tables list
-            if tables and table_name not in tables:
-                print(f"Skipping {table_name} (not in tables list)")
-                continue
-
-            print(f"Importing {csv_path.name} into {table_name}...", end=" ")
-            try:
-                rows = import_csv_file(conn, csv_path, table_name)
-                results[table_name] = rows
-                print(f"✓ {rows} rows")
-            except Exception as e:
-                print(f"✗ Error: {e}")
-                results[table_name] = f"Error: {e}"
-                conn.rollback()
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = [
+                ex.submit(run_import, csv_path, table_name)
+                for csv_path, table_name in tasks
+            ]
+            for future in as_completed(futures):
+                table_name, rows = future.result()
+                if isinstance(rows, Exception):
+                    print(f"Importing {table_name}... ✗ Error: {rows}")
+                    results[table_name] = f"Error: {rows}"
+                else:
+                    print(f"Importing {table_name}... ✓ {rows} rows")
+                    results[table_name] = rows
+
+        for conn, uncommitted in conns:
+            commit(conn, uncommitted)
+        for table_name, e in lost:
+            print(f"Importing {table_name}... ✗ Error: {e}")
+            results[table_name] = f"Error: {e}"
     finally:
-        conn.close()
+        for conn, _ in conns:
+            conn.close()
+            _forget_prepared_statements(conn)
 
     return results
 
@@ -164,6 +767,40 @@ def main():
         default=None,
         help="Specific tables to import (default: all CSV files)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of concurrent imports (default: min(files, CPUs))",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Disable synchronous commit/FK checks and rebuild indexes after load",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="Rows per COPY (default: 200000 for files >= 256 MiB, 0 disables)",
+    )
+    parser.add_argument(
+        "--binary",
+        action="store_true",
+        help="Convert rows to binary COPY format on the client",
+    )
+    parser.add_argument(
+        "--commit-every",
+        type=int,
+        default=None,
+        help="Commit after this many files per connection (default: once)",
+    )
+    parser.add_argument(
+        "--server-side",
+        action="store_true",
+        help="Have the server read the CSV files from its own filesystem",
+    )
 
     args = parser.parse_args()
 
@@ -178,6 +815,12 @@ def main():
         connection_uri,
         args.csv_directory,
         args.tables,
+        args.jobs,
+        args.bulk,
+        args.chunk_rows,
+        args.binary,
+        args.commit_every,
+        args.server_side,
     )
 
     print("-" * 50)
@@ -1,5 +1,9 @@
 import functools
+import itertools
+import re
+from contextlib import contextmanager
 from psycopg2.extensions import connection as _pgconn
+from psycopg2.extras import execute_batch, execute_values
 from abc import ABC, abstractmethod
 from typing import Tuple, Optional
 
@@ -7,6 +11,11 @@ import dblib.result_collector as rc
 from dblib import result_pb2 as rslt
 
 
+# Matches queries with a single %s placeholder for the whole VALUES list, as
+# expected by psycopg2.extras.execute_values.
+_VALUES_LIST_RE = re.compile(r"\bVALUES\s+%s", re.IGNORECASE)
+
+
 def _require_connection(func):
     """Decorator that checks if database connection is established before calling the method."""
 
@@ -19,6 +28,91 @@ def _require_connection(func):
     return wrapper
 
 
+class QueryError(Exception):
+    """
+    Raised when a query fails. The original driver exception is kept as
+    __cause__ and as the error attribute. The message is only formatted when
+    it is actually needed, since failing queries can be frequent and
+    expected, e.g. for serialization conflicts.
+    """
+
+    def __init__(self, query, vars, error: Exception):
+        super().__init__(query, vars, error)
+        self.query = query
+        self.vars = vars
+        self.error = error
+
+    def __str__(self) -> str:
+        return (
+            f"Error executing sql query: {self.query}; {self.vars}; "
+            f"{self.error}"
+        )
+
+
+class Pipeline:
+    """
+    Statements queued to be sent to the server as a single multi-statement
+    query, so they cost one round-trip instead of one each. Created by
+    DBToolSuite.pipeline().
+
+    The server runs a multi-statement query as one transaction, even in
+    autocommit mode, so if one statement of a batch fails the earlier ones
+    are rolled back too.
+    """
+
+    def __init__(self, tools: "DBToolSuite"):
+        self._tools = tools
+        self._queries = []
+
+    def execute(self, query: str, vars=None) -> None:
+        """
+        Queues a statement. Its results, if any, are discarded, so only use
+        this for statements whose results aren't needed.
+        """
+        with self._tools.conn.cursor() as cur:
+            stmt = cur.mogrify(query, vars).strip().rstrip(b";")
+        self._queries.append(stmt)
+
+    def flush(self) -> None:
+        """Sends all queued statements in one round-trip."""
+        if not self._queries:
+            return
+        # The separator is on its own line so that a statement ending in a
+        # -- comment doesn't swallow it.
+        batch = b"\n;\n".join(self._queries)
+        self._queries.clear()
+        try:
+            with self._tools.conn.cursor() as cur:
+                cur.execute(batch)
+        except Exception as e:
+            raise QueryError(batch, None, e) from e
+
+
+def _format_column_definition(
+    col_name: str,
+    udt_name: str,
+    is_nullable: str,
+    char_len: Optional[int],
+    num_prec: Optional[int],
+    num_scale: Optional[int],
+) -> str:
+    """Formats an information_schema.columns row as a CREATE TABLE column line."""
+    data_type = udt_name
+
+    # Append length for character types
+    if char_len is not None:
+        data_type += f"({char_len})"
+    # Append precision and scale for numeric types
+    elif udt_name in ("numeric", "decimal") and num_prec is not None:
+        data_type += f"({num_prec}, {num_scale})"
+
+    # Construct the column definition line
+    definition = f"  {col_name} {data_type}"
+    if is_nullable == "NO":
+        definition += " NOT NULL"
+    return definition
+
+
 class DBToolSuite(ABC):
     """
     An API for interacting with Postgres via a shared connection. The connection
@@ -34,6 +128,8 @@ class DBToolSuite(ABC):
         self.result_collector = result_collector
         if not self.result_collector:
             print("Result collector is not provided.")
+        # The pipeline of the current pipeline() block, if any.
+        self._pipeline = None
 
     def close_connection(self) -> None:
         """
@@ -112,9 +208,17 @@ class DBToolSuite(ABC):
         """
         Returns the schema of a specific table in a CREATE TABLE format.
         """
+        return self.get_table_schemas([table_name])[table_name]
+
+    def get_table_schemas(self, table_names: list[str]) -> dict[str, str]:
+        """
+        Returns the schemas of multiple tables in a CREATE TABLE format, keyed
+        by table name. All tables are looked up with a single query.
+        """
         # Query for column details, including length and precision/scale
         query = """
         SELECT
+            table_name,
             column_name,
             udt_name,
             is_nullable,
@@ -124,43 +228,29 @@ class DBToolSuite(ABC):
         FROM
             information_schema.columns
         WHERE
-            table_name = %s
+            table_name = ANY(%s)
         ORDER BY
+            table_name,
             ordinal_position;
         """
-        columns = self.execute_sql(query, (table_name,))
+        columns = self.execute_sql(query, (list(table_names),)) or []
 
-        if not columns:
-            return f"Error: Table '{table_name}' not found."
+        schemas = {}
+        for table_name, table_columns in itertools.groupby(
+            columns, key=lambda col: col[0]
+        ):
+            column_definitions = [
+                _format_column_definition(*col[1:]) for col in table_columns
+            ]
+            # Assemble the final CREATE TABLE string
+            schemas[table_name] = "CREATE TABLE {} (\n{}\n);".format(
+                table_name, ",\n".join(column_definitions)
+            )
 
-        column_definitions = []
-        for (
-            col_name,
-            udt_name,
-            is_nullable,
-            char_len,
-            num_prec,
-            num_scale,
-        ) in columns:
-            data_type = udt_name
-
-            # Append length for character types
-            if char_len is not None:
-                data_type += f"({char_len})"
-            # Append precision and scale for numeric types
-            elif udt_name in ("numeric", "decimal") and num_prec is not None:
-                data_type += f"({num_prec}, {num_scale})"
-
-            # Construct the column definition line
-            definition = f"  {col_name} {data_type}"
-            if is_nullable == "NO":
-                definition += " NOT NULL"
-            column_definitions.append(definition)
-
-        # Assemble the final CREATE TABLE string
-        return "CREATE TABLE {} (\n{}\n);".format(
-            table_name, ",\n".join(column_definitions)
-        )
+        for table_name in table_names:
+            if table_name not in schemas:
+                schemas[table_name] = f"Error: Table '{table_name}' not found."
+        return schemas
 
     #########################################################################
     # API exposed to interact with a branchable database
@@ -171,6 +261,7 @@ class DBToolSuite(ABC):
         """
         Creates a new branch. This is always timed.
         """
+        self._flush_pipeline()
         try:
             with self.result_collector.maybe_time_ops(
                 op_type=rslt.OpType.BRANCH_CREATE, timed=True
@@ -186,6 +277,8 @@ class DBToolSuite(ABC):
         Connects to an existing branch to allow reading and writing data to that
         branch. Return a bool indicating whether the operation was successful.
         """
+        # Queued statements belong to the branch they were queued on.
+        self._flush_pipeline()
         try:
             with self.result_collector.maybe_time_ops(
                 op_type=rslt.OpType.BRANCH_CONNECT, timed=timed
@@ -204,6 +297,7 @@ class DBToolSuite(ABC):
         purposes only, while branch_id is needed to uniquely identify the
         current branch.
         """
+        self._flush_pipeline()
         return self._get_current_branch_impl()
 
     @_require_connection
@@ -211,12 +305,44 @@ class DBToolSuite(ABC):
         """
         Commits any pending changes to the database with an optional message.
         """
+        self._flush_pipeline()
         with self.result_collector.maybe_time_ops(timed, rslt.OpType.COMMIT):
             self._prepare_commit(message)
             self.conn.commit()
         if timed:
             self.result_collector.flush_record()
 
+    @contextmanager
+    def pipeline(self):
+        """
+        Returns a Pipeline whose statements are sent to the server in one
+        round-trip when the block exits. They're also sent before any other
+        query, commit or branch operation of this suite, so that statements
+        run in order and on the branch they were queued on. A nested
+        pipeline() block shares the outer block's pipeline.
+
+            with db_tools.pipeline() as pipe:
+                pipe.execute("UPDATE t SET a = %s WHERE id = %s", (1, 2))
+                pipe.execute("DELETE FROM t WHERE id = %s", (3,))
+        """
+        if self._pipeline is not None:
+            yield self._pipeline
+            return
+        self._pipeline = Pipeline(self)
+        try:
+            yield self._pipeline
+            self._pipeline.flush()
+        finally:
+            self._pipeline = None
+
+    @_require_connection
+    def _flush_pipeline(self) -> None:
+        """
+        Sends all statements queued in the current pipeline, if any.
+        """
+        if self._pipeline is not None:
+            self._pipeline.flush()
+
     @_require_connection
     def execute_sql(
         self,
@@ -231,6 +357,8 @@ class DBToolSuite(ABC):
         fine-grained timing and multiple queries to be executed in a single
         transaction.
         """
+        self._flush_pipeline()
+
         res = None
         try:
             with self.conn.cursor() as cur:
@@ -243,10 +371,47 @@ class DBToolSuite(ABC):
                         res = cur.fetchall()
                 # print(f"Executed query: {query} with vars: {vars}")
         except Exception as e:
-            raise Exception(f"Error executing sql query: {query}; {vars}; {e}")
+            raise QueryError(query, vars, e) from e
         if timed:
             # Record query with args for debugging/analysis
             query_with_args = f"{query} -- args: {vars}" if vars else query
             self.result_collector.record_sql_query(query_with_args)
             self.result_collector.flush_record()
         return res
+
+    @_require_connection
+    def execute_many_sql(
+        self,
+        query: str,
+        vars_list: list,
+        page_size: int = 1000,
+        timed: bool = False,
+    ) -> None:
+        """
+        Runs an SQL query once for each set of parameters in vars_list, sending
+        page_size of them per round-trip.
+
+        If the query has a single placeholder for its VALUES list, e.g.
+        "INSERT INTO t (a, b) VALUES %s", each page is sent as one multi-row
+        INSERT. Otherwise each page is sent as one batch of statements.
+        When timed, the whole call is recorded as a single operation.
+        """
+        self._flush_pipeline()
+
+        try:
+            with self.conn.cursor() as cur:
+                op_type = rc.GetOpTypeFromSQL(query)
+                with self.result_collector.maybe_time_ops(timed, op_type):
+                    if _VALUES_LIST_RE.search(query):
+                        execute_values(
+                            cur, query, vars_list, page_size=page_size
+                        )
+                    else:
+                        execute_batch(
+                            cur, query, vars_list, page_size=page_size
+                        )
+        except Exception as e:
+            raise QueryError(query, vars_list, e) from e
+        if timed:
+            self.result_collector.record_sql_query(query)
+            self.result_collector.flush_record()
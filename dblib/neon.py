@@ -1,9 +1,14 @@
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
 from typing import Tuple
 from dotenv import load_dotenv
 import psycopg2
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from psycopg2.extensions import connection as _pgconn
 from dblib.db_api import DBToolSuite
@@ -15,6 +20,30 @@ API_KEY = os.environ.get("NEON_API_KEY_ORG", "")
 ORG_ID = os.environ.get("NEON_ORG_ID", "")
 neon = NeonAPI(api_key=API_KEY)
 NEON_API_BASE_URL = "https://console.neon.tech/api/v2/"
+# Maximum number of branch connections kept open for reuse.
+MAX_CACHED_CONNECTIONS = 8
+
+
+def _make_api_session() -> requests.Session:
+    """
+    Creates a shared HTTP session for the Neon API so that TCP/TLS connections
+    are kept alive and reused across requests.
+    """
+    session = requests.Session()
+    session.headers.update(
+        {
+            "Authorization": f"Bearer {API_KEY}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+    )
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    )
+    session.mount("https://", adapter)
+    return session
 
 
 class NeonToolSuite(DBToolSuite):
@@ -22,6 +51,11 @@ class NeonToolSuite(DBToolSuite):
     A suite of tools for interacting with a Neon database on a shared connection.
     """
 
+    _SESSION = _make_api_session()
+    # Pool for issuing Neon API calls concurrently, e.g. fetching branch
+    # connection URIs off the critical path.
+    _PREFETCH_POOL = ThreadPoolExecutor(max_workers=8)
+
     @classmethod
     def create_neon_project(cls, project_name: str) -> str:
         project_dict = {"project": {"pg_version": 17, "name": project_name}}
@@ -52,6 +86,26 @@ class NeonToolSuite(DBToolSuite):
         conn = psycopg2.connect(uri)
         if autocommit:
             conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+
+        # Warm up the branch map with the connection URIs of all existing
+        # branches, so that connecting to them later doesn't need API calls.
+        # A branch whose URI can't be fetched is looked up again on connect.
+        try:
+            branches = cls.get_project_branches(project_id)["branches"]
+            uris = cls._PREFETCH_POOL.map(
+                lambda b: cls._try_get_neon_connection_uri(
+                    project_id, b["id"], database_name
+                ),
+                branches,
+            )
+            all_branches = {
+                b["name"]: (b["id"], b_uri)
+                for b, b_uri in zip(branches, uris)
+            }
+        except Exception:
+            conn.close()
+            raise
+
         return cls(
             connection=conn,
             result_collector=result_collector,
@@ -60,6 +114,8 @@ class NeonToolSuite(DBToolSuite):
             branch_id=branch_id,
             autocommit=autocommit,
             connection_uri=uri,
+            all_branches=all_branches,
+            database_name=database_name,
         )
 
     @classmethod
@@ -67,25 +123,20 @@ class NeonToolSuite(DBToolSuite):
         """
         Helper method to make requests to the Neon API.
         """
-        headers = kwargs.pop("headers", {})
-        headers["Authorization"] = f"Bearer {API_KEY}"
-        headers["Accept"] = "application/json"
-        headers["Content-Type"] = "application/json"
-
-        r = requests.request(
-            method, NEON_API_BASE_URL + endpoint, headers=headers, **kwargs
-        )
+        r = cls._SESSION.request(method, NEON_API_BASE_URL + endpoint, **kwargs)
 
         r.raise_for_status()
 
         return r.json()
 
     @classmethod
+    @functools.lru_cache(maxsize=256)
     def _get_neon_connection_uri(
         cls, project_id: str, branch_id: str, db_name: str
     ) -> str:
         """
         Retrieves the connection URI for a specific Neon database branch.
+        Results are cached since the URI of a branch doesn't change.
         """
         endpoint = (
             f"projects/{project_id}/connection_uri?branch_id={branch_id}"
@@ -94,6 +145,19 @@ class NeonToolSuite(DBToolSuite):
         response = cls._request("GET", endpoint)
         return response["uri"]
 
+    @classmethod
+    def _try_get_neon_connection_uri(
+        cls, project_id: str, branch_id: str, db_name: str
+    ) -> str:
+        """
+        Like _get_neon_connection_uri, but returns None if the lookup fails.
+        """
+        try:
+            return cls._get_neon_connection_uri(project_id, branch_id, db_name)
+        except Exception as e:
+            print(f"Could not get connection URI for branch '{branch_id}': {e}")
+            return None
+
     @classmethod
     def get_project_branches(cls, project_id: str) -> dict:
         """
@@ -111,6 +175,8 @@ class NeonToolSuite(DBToolSuite):
         branch_id: str,
         autocommit: bool,
         connection_uri: str = None,
+        all_branches: dict = None,
+        database_name: str = None,
     ):
         super().__init__(connection, result_collector)
         self.project_id = project_id
@@ -119,7 +185,36 @@ class NeonToolSuite(DBToolSuite):
         self.current_branch_id = branch_id
         self.autocommit = autocommit
         self._connection_uri = connection_uri
-        self._all_branches = {branch_name: (branch_id, None)}
+        # A suite is tied to a single database, which is the same on every
+        # branch.
+        self._db_name = (
+            database_name or connection.get_dsn_parameters()["dbname"]
+        )
+        # Mapping from branch name to (branch_id, connection_uri). It's seeded
+        # with every branch in the project, so that connecting to a branch
+        # for the first time doesn't need to list the branches again.
+        if all_branches is None:
+            all_branches = {
+                name: (bid, None)
+                for name, (bid, _) in self._get_neon_branches().items()
+            }
+        self._all_branches = dict(all_branches)
+        if connection_uri or branch_name not in self._all_branches:
+            self._all_branches[branch_name] = (branch_id, connection_uri)
+        # Mapping from branch name to a pending connection URI lookup.
+        self._pending_uris = {}
+        # Open connections by branch ID, in least recently used order.
+        self._conn_cache = OrderedDict({branch_id: connection})
+
+    def close_connection(self) -> None:
+        """
+        Closes the current connection and all cached branch connections.
+        """
+        for conn in self._conn_cache.values():
+            if not conn.closed:
+                conn.close()
+        self._conn_cache.clear()
+        super().close_connection()
 
     def get_uri_for_db_setup(self) -> str:
         """Returns the connection URI for database setup operations (e.g., psql)."""
@@ -145,11 +240,19 @@ class NeonToolSuite(DBToolSuite):
 
     def delete_db(self, db_name: str) -> None:
         """
-        Deletes the database from all branches in the Neon project.
+        Deletes the database from all branches in the Neon project. The
+        per-branch API calls are issued concurrently.
         """
-        for _, (branch_id, _) in self._get_neon_branches().items():
+        branch_ids = [bid for bid, _ in self._get_neon_branches().values()]
+        for branch_id in branch_ids:
             print(f"Deleting database '{db_name}' on branch ID '{branch_id}'")
-            self._delete_db_on_branch(branch_id, db_name)
+        # Consume the results so that any failed request raises here.
+        list(
+            self._PREFETCH_POOL.map(
+                lambda bid: self._delete_db_on_branch(bid, db_name),
+                branch_ids,
+            )
+        )
 
     def _create_branch_impl(
         self, branch_name: str, parent_id: str = None
@@ -165,7 +268,17 @@ class NeonToolSuite(DBToolSuite):
 
         # This returns a BranchOperations object with .branch attribute
         new_branch = neon.branch_create(self.project_id, **branch_payload)
-        self._all_branches[branch_name] = (new_branch.branch.id, "")
+        new_branch_id = new_branch.branch.id
+        self._all_branches[branch_name] = (new_branch_id, "")
+
+        # Fetch the connection URI in the background so that a subsequent
+        # connect to this branch doesn't wait on the API.
+        self._pending_uris[branch_name] = self._PREFETCH_POOL.submit(
+            self.__class__._get_neon_connection_uri,
+            self.project_id,
+            new_branch_id,
+            self._db_name,
+        )
 
     def _connect_branch_impl(self, branch_name: str) -> None:
         """
@@ -177,27 +290,48 @@ class NeonToolSuite(DBToolSuite):
         #
         # Note that the first time we connect to a branch, we need to make an API
         # call to get the connection string, which may be add slight additional
-        # overhead.
-        branch_id = self._all_branches[branch_name][0]
-        uri = self._all_branches[branch_name][1]
+        # overhead. Connections are kept open afterwards, so switching back to
+        # a recently used branch reuses its connection.
+        branch_id, uri = self._all_branches.get(branch_name, (None, None))
         if not branch_id:
+            # The branch was created outside of this suite, refresh the map.
             all_branches = self._get_neon_branches()
+            for name, (bid, _) in all_branches.items():
+                self._all_branches.setdefault(name, (bid, None))
             if branch_name not in all_branches:
                 raise ValueError(f"Branch '{branch_name}' does not exist.")
             branch_id = all_branches[branch_name][0]
+        pending = self._pending_uris.pop(branch_name, None)
+        if not uri and pending and not pending.exception():
+            uri = pending.result()
         if not uri:
             uri = self.__class__._get_neon_connection_uri(
                 self.project_id,
                 branch_id,
-                self.conn.get_dsn_parameters()["dbname"],
+                self._db_name,
             )
             # Cache the URI - replace tuple since tuples are immutable
             self._all_branches[branch_name] = (branch_id, uri)
 
-        self.conn.close()
-        self.conn = psycopg2.connect(uri)
-        if self.autocommit:
-            self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        # Like closing it used to, parking the current connection discards
+        # its open transaction, so that switching back doesn't resume it.
+        current = self.conn
+        if not self.autocommit and current is not None and not current.closed:
+            current.rollback()
+
+        cached = self._conn_cache.get(branch_id)
+        if cached is not None and not cached.closed:
+            self._conn_cache.move_to_end(branch_id)
+            self.conn = cached
+        else:
+            self.conn = psycopg2.connect(uri)
+            if self.autocommit:
+                self.conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            self._conn_cache[branch_id] = self.conn
+            # Evict the least recently used connection if over capacity.
+            if len(self._conn_cache) > MAX_CACHED_CONNECTIONS:
+                _, evicted = self._conn_cache.popitem(last=False)
+                evicted.close()
 
         self.current_branch_name = branch_name
         self.current_branch_id = branch_id
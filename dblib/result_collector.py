@@ -1,16 +1,79 @@
 import os
+import sys
 import uuid
 import time
 from contextlib import contextmanager
+from functools import lru_cache
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from dblib import result_pb2 as rslt
-from util.sql_parse import get_sql_operation_keyword
+from util.sql_parse import MAX_CACHED_SQL_LENGTH, get_sql_operation_keyword
+
+# Type of string columns that only take a few distinct values in a run.
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+# Columns of the benchmark results parquet file, matching result.proto.
+_SCHEMA = pa.schema(
+    [
+        pa.field("run_id", _DICTIONARY_STRING),
+        pa.field("random_seed", pa.int64()),
+        pa.field("iteration_number", pa.int64()),
+        pa.field("op_type", pa.int64()),
+        pa.field("initial_db_size", pa.int64()),
+        pa.field("table_name", _DICTIONARY_STRING),
+        pa.field("table_schema", _DICTIONARY_STRING),
+        pa.field("num_keys_touched", pa.int64()),
+        pa.field("latency", pa.float64()),
+        pa.field("latency_ns", pa.int64()),
+        pa.field("disk_size_before", pa.int64()),
+        pa.field("disk_size_after", pa.int64()),
+        pa.field("sql_query", pa.string()),
+    ]
+)
+# Columns buffered by flush_record; latency is computed from latency_ns when
+# a batch is written.
+_BUFFERED_COLUMNS = [name for name in _SCHEMA.names if name != "latency"]
+# Columns that are the same for every record with the same context, built as
+# dictionary arrays so that each distinct string is only converted once.
+_CONTEXT_COLUMNS = [
+    field.name for field in _SCHEMA if field.type == _DICTIONARY_STRING
+]
+# Low-cardinality columns that are dictionary encoded in the parquet file.
+_DICTIONARY_COLUMNS = [
+    "run_id",
+    "op_type",
+    "table_name",
+    "table_schema",
+    "sql_query",
+]
+
+# Output directories already created by a ResultCollector in this process.
+_created_dirs: set[str] = set()
+
+# Map from the primary keyword of a SQL statement to its OpType.
+_KEYWORD_TO_OP_TYPE = {
+    "SELECT": rslt.OpType.READ,
+    "INSERT": rslt.OpType.INSERT,
+    "UPDATE": rslt.OpType.UPDATE,
+    "DELETE": rslt.OpType.UPDATE,  # DELETE is a write operation like UPDATE
+    "WITH": rslt.OpType.READ,  # If we still have WITH, it's likely a CTE query (read)
+}
+
+
+def _to_dictionary_array(values: list[str]) -> pa.DictionaryArray:
+    """Builds a dictionary array from values with few distinct strings."""
+    index = {}
+    indices = [index.setdefault(value, len(index)) for value in values]
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices, pa.int32()), pa.array(list(index), pa.string())
+    )
 
 
 def GetOpTypeFromSQL(sql: str) -> rslt.OpType:
     """
-    Determine the operation type from a SQL statement.
+    Determine the operation type from a SQL statement. Results are cached,
+    since benchmarks run the same statements many times, except for
+    statements too long to be cached by get_sql_operation_keyword.
 
     Handles edge cases like:
     - CTEs (WITH clauses)
@@ -24,22 +87,22 @@ def GetOpTypeFromSQL(sql: str) -> rslt.OpType:
     Returns:
         OpType enum corresponding to the main operation
     """
+    if sql and len(sql) < MAX_CACHED_SQL_LENGTH:
+        return _get_op_type_from_sql_cached(sql)
+    return _get_op_type_from_sql(sql)
+
+
+def _get_op_type_from_sql(sql: str) -> rslt.OpType:
     # Get the primary operation keyword
     keyword = get_sql_operation_keyword(sql)
 
     if not keyword:
         return rslt.OpType.UNSPECIFIED
 
-    # Map keywords to OpType
-    keyword_map = {
-        "SELECT": rslt.OpType.READ,
-        "INSERT": rslt.OpType.INSERT,
-        "UPDATE": rslt.OpType.UPDATE,
-        "DELETE": rslt.OpType.UPDATE,  # DELETE is a write operation like UPDATE
-        "WITH": rslt.OpType.READ,  # If we still have WITH, it's likely a CTE query (read)
-    }
+    return _KEYWORD_TO_OP_TYPE.get(keyword, rslt.OpType.UNSPECIFIED)
+
 
-    return keyword_map.get(keyword, rslt.OpType.UNSPECIFIED)
+_get_op_type_from_sql_cached = lru_cache(maxsize=2048)(_get_op_type_from_sql)
 
 
 def str_to_op_type(op_str: str) -> rslt.OpType:
@@ -60,25 +123,55 @@ def str_to_op_type(op_str: str) -> rslt.OpType:
 
 
 class ResultCollector:
-    def __init__(self, run_id: str = None, output_dir: str = "/tmp/run_stats"):
-        self.reset()
+    def __init__(
+        self,
+        run_id: str = None,
+        output_dir: str = "/tmp/run_stats",
+        batch_size: int = 4096,
+    ):
         self.run_id = run_id or str(uuid.uuid4())
         self.output_dir = output_dir
+        # Number of records buffered before they're written to the file.
+        self.batch_size = batch_size
+        # Parquet writer that results are streamed to, opened on first write.
+        self._writer = None
+        # Number of records written to the in-progress file so far.
+        self._num_written = 0
+        self._writer_path = os.path.join(
+            output_dir, f"{self.run_id}.parquet.inprogress"
+        )
+        self.reset()
 
         # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        if output_dir not in _created_dirs:
+            os.makedirs(output_dir, exist_ok=True)
+            _created_dirs.add(output_dir)
+
+    def __del__(self):
+        if self._writer is not None:
+            self._writer.close()
+
+    def _discard_writer(self):
+        """Close the parquet writer and remove its unfinished file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            os.remove(self._writer_path)
+        self._num_written = 0
 
     def _reset_metrics(self):
         """Reset all metric fields for a new record."""
         self._current_op_type = rslt.OpType.UNSPECIFIED
-        self._current_latency = 0.0
+        self._current_latency_ns = 0
         self._num_keys_touched = 0
         self._sql_query = ""
 
     def reset(self):
-        """Reset all collected timing data and proto messages."""
-        # Proto messages collected during benchmark
-        self.results = []
+        """Reset all collected records and timing data."""
+        # Records already streamed to the unfinished file are dropped too.
+        self._discard_writer()
+        # Records not yet written to the parquet file, stored column-wise.
+        self._cols = {name: [] for name in _BUFFERED_COLUMNS}
         self.iteration_counter = 0
 
         # Reset metrics
@@ -88,6 +181,7 @@ class ResultCollector:
         self.current_table_name = ""
         self.current_table_schema = ""
         self.initial_db_size = 0
+        self._seed = 0
 
     def set_context(
         self,
@@ -97,8 +191,9 @@ class ResultCollector:
         seed: int,
     ):
         """Set context information for the next operation to be timed."""
-        self.current_table_name = table_name
-        self.current_table_schema = table_schema
+        # Interned so that every record of this context shares one string.
+        self.current_table_name = sys.intern(table_name)
+        self.current_table_schema = sys.intern(table_schema)
         self.initial_db_size = initial_db_size
         self._seed = seed
 
@@ -118,17 +213,17 @@ class ResultCollector:
         if not timed:
             yield
             return
-        start_time = time.perf_counter()
+        start_time = time.perf_counter_ns()
+        succeeded = False
         try:
             yield
-        # Propagate exceptions.
-        except Exception as e:
-            raise e
-        # Only collect elapsed time if no exceptions.
-        else:
-            end_time = time.perf_counter()
-            self._validate_and_set_op_type(op_type)
-            self._current_latency = end_time - start_time
+            succeeded = True
+        finally:
+            # Only collect elapsed time if no exceptions, which propagate.
+            if succeeded:
+                end_time = time.perf_counter_ns()
+                self._validate_and_set_op_type(op_type)
+                self._current_latency_ns = end_time - start_time
 
     def record_num_keys_touched(self, num_keys: int) -> None:
         self._num_keys_touched = num_keys
@@ -138,62 +233,90 @@ class ResultCollector:
 
     def flush_record(self):
         """
-        Create a Result proto with all current context and metrics, save it, and reset.
+        Save a record with all current context and metrics, and reset the
+        metrics. Records are written to the parquet file in batches.
         """
-
-        # Create and fill the Result proto
-        result = rslt.Result()
-        result.run_id = self.run_id
-        result.iteration_number = self.iteration_counter
-        result.table_name = self.current_table_name
-        result.table_schema = self.current_table_schema
-        result.initial_db_size = self.initial_db_size
-        result.random_seed = self._seed
-
-        # Fill in collected metrics
-        result.op_type = self._current_op_type
-        result.num_keys_touched = self._num_keys_touched
-        result.latency = self._current_latency
-        result.sql_query = self._sql_query
-
-        # Append to results
-        self.results.append(result)
+        cols = self._cols
+        cols["run_id"].append(self.run_id)
+        cols["random_seed"].append(self._seed)
+        cols["iteration_number"].append(self.iteration_counter)
+        cols["op_type"].append(self._current_op_type)
+        cols["initial_db_size"].append(self.initial_db_size)
+        cols["table_name"].append(self.current_table_name)
+        cols["table_schema"].append(self.current_table_schema)
+        cols["num_keys_touched"].append(self._num_keys_touched)
+        cols["latency_ns"].append(self._current_latency_ns)
+        cols["disk_size_before"].append(0)
+        cols["disk_size_after"].append(0)
+        cols["sql_query"].append(self._sql_query)
         self.iteration_counter += 1
 
         # Reset metric fields for next record
         self._reset_metrics()
 
-    def write_to_parquet(self, filename: str = None):
-        """Write all collected benchmark results to a parquet file."""
+        if len(cols["run_id"]) >= self.batch_size:
+            self._write_batch()
+
+    def as_proto(self, iteration_number: int) -> rslt.Result:
+        """
+        Build a Result proto from the record with the given iteration number.
+        Only records not yet written to the parquet file are available, since
+        the buffer is cleared after every batch_size records.
 
-        if not self.results:
+        Raises IndexError if the record was already written or doesn't exist.
+        """
+        iterations = self._cols["iteration_number"]
+        i = iteration_number - (iterations[0] if iterations else 0)
+        if not 0 <= i < len(iterations):
+            raise IndexError(
+                f"Record {iteration_number} is not in the unwritten buffer"
+            )
+        fields = {name: values[i] for name, values in self._cols.items()}
+        return rslt.Result(latency=fields["latency_ns"] / 1e9, **fields)
+
+    def _write_batch(self):
+        """Write the buffered records to the parquet file and clear them."""
+        if not self._cols["run_id"]:
+            return
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(
+                self._writer_path,
+                _SCHEMA,
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=_DICTIONARY_COLUMNS,
+                data_page_size=1 << 20,
+            )
+        latency_ns = pa.array(self._cols["latency_ns"], pa.int64())
+        latency = pc.divide(pc.cast(latency_ns, pa.float64()), 1e9)
+        columns = dict(self._cols, latency=latency)
+        for name in _CONTEXT_COLUMNS:
+            columns[name] = _to_dictionary_array(columns[name])
+        batch = pa.RecordBatch.from_pydict(columns, schema=_SCHEMA)
+        self._writer.write_batch(batch)
+        self._num_written += batch.num_rows
+        for values in self._cols.values():
+            values.clear()
+
+    def write_to_parquet(self, filename: str = None):
+        """
+        Write the benchmark results collected since the last write to a
+        parquet file.
+        """
+        # Write the remaining records
+        self._write_batch()
+        if self._writer is None:
             print("No results to write.")
             return
 
         filename = filename or f"{self.run_id}.parquet"
         filepath = os.path.join(self.output_dir, filename)
 
-        # Convert proto messages to dictionary rows
-        rows = []
-        for result in self.results:
-            row = {
-                "run_id": result.run_id,
-                "random_seed": result.random_seed,
-                "iteration_number": result.iteration_number,
-                "op_type": result.op_type,  # Convert enum value to name
-                "initial_db_size": result.initial_db_size,
-                "table_name": result.table_name,
-                "table_schema": result.table_schema,
-                "num_keys_touched": result.num_keys_touched,
-                "latency": result.latency,
-                "disk_size_before": result.disk_size_before,
-                "disk_size_after": result.disk_size_after,
-                "sql_query": result.sql_query,
-            }
-            rows.append(row)
-
-        # Create PyArrow table and write to parquet
-        table = pa.Table.from_pylist(rows)
-        pq.write_table(table, filepath)
-
-        print(f"Wrote {len(rows)} benchmark results to {filepath}")
+        # Finalize the file, the next write starts a new one
+        num_written = self._num_written
+        self._writer.close()
+        self._writer = None
+        self._num_written = 0
+        os.replace(self._writer_path, filepath)
+
+        print(f"Wrote {num_written} benchmark results to {filepath}")
@@ -1,9 +1,36 @@
-import random
 import re
-from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 from faker import Faker
 
 ColumnDef = Dict[str, Any]
+# How to generate a column's values: (kind, params), resolved once per column.
+ColumnPlan = Tuple[str, tuple]
+
+# Name heuristics for realistic data: (name substrings, faker method, default
+# max length). Checked in order, before the type-based rules.
+_NAME_HEURISTICS = [
+    (("city",), "city", 20),
+    (("state",), "state_abbr", None),
+    (("zip", "postal"), "zipcode", 9),
+    (("phone",), "phone_number", 16),
+    (("first",), "first_name", 40),
+    (("last",), "last_name", 40),
+    (("email",), "email", 40),
+]
+
+# Number of values pre-generated per Faker method. Name heuristic columns
+# sample from these pools instead of calling Faker for every value.
+FAKER_POOL_SIZE = 10_000
+
+# Generated timestamps fall within this many seconds before now (5 years).
+TIMESTAMP_RANGE_SECONDS = 5 * 365 * 24 * 60 * 60
+
+_TABLE_RE = re.compile(r"CREATE TABLE\s+([\w\.]+)\s*\(", re.IGNORECASE)
+_CONTENT_RE = re.compile(r"\((.*)\)", re.DOTALL)
+_COL_RE = re.compile(r"(\w+)\s+([\w\(\), ]+)")
+_PARAMS_RE = re.compile(r"\((\d+)(?:,\s*(\d+))?\)")
 
 
 class DynamicDataGenerator:
@@ -16,21 +43,23 @@ class DynamicDataGenerator:
         self.fake: Faker = Faker()
         self.table_name: str = ""
         self.columns: Dict[str, ColumnDef] = {}
+        self._column_plan: Dict[str, ColumnPlan] = {}
+        self._rng = np.random.default_rng()
+        # Pre-generated values by Faker method, filled on first use.
+        self._faker_pools: Dict[str, List[str]] = {}
         self._parse_ddl()
 
     def _parse_ddl(self) -> None:
         """Parses DDL to extract table name, columns, and primary keys."""
         print(f"Parsing DDL schema...\n{self.ddl}\n")
         # Extract table name
-        table_match = re.search(
-            r"CREATE TABLE\s+([\w\.]+)\s*\(", self.ddl, re.IGNORECASE
-        )
+        table_match = _TABLE_RE.search(self.ddl)
         if not table_match:
             raise ValueError("Could not parse table name from DDL.")
         self.table_name = table_match.group(1)
 
         # Extract content within parentheses
-        content_match = re.search(r"\((.*)\)", self.ddl, re.DOTALL)
+        content_match = _CONTENT_RE.search(self.ddl)
         if not content_match:
             raise ValueError("Could not parse column definitions from DDL.")
         content = content_match.group(1).strip()
@@ -43,14 +72,14 @@ class DynamicDataGenerator:
             ):
                 continue
 
-            parts = re.match(r"(\w+)\s+([\w\(\), ]+)", line)
+            parts = _COL_RE.match(line)
             if parts:
                 name, type_full = parts.group(1), parts.group(2).strip()
                 type_base = type_full.split("(")[0].lower()
                 length: Optional[int] = None
                 precision: Optional[Tuple[int, int]] = None
 
-                params_match = re.search(r"\((\d+)(?:,\s*(\d+))?\)", type_full)
+                params_match = _PARAMS_RE.search(type_full)
                 if params_match:
                     if params_match.group(2):
                         precision = (
@@ -66,6 +95,7 @@ class DynamicDataGenerator:
                     "length": length,
                     "precision": precision,
                 }
+                self._column_plan[name] = self._plan_column(self.columns[name])
 
         print(
             f"✅ Schema parsed for table '{self.table_name}' with {len(self.columns)} columns."
@@ -74,47 +104,90 @@ class DynamicDataGenerator:
         # for col_name, col_def in self.columns.items():
         #     print(f" - Column: {col_name}, Definition: {col_def}")
 
-    def generate_value(self, column_name: str) -> Any:
-        """Generates a single fake value based on column type and name."""
-        column = self.columns[column_name]
+    def _plan_column(self, column: ColumnDef) -> ColumnPlan:
+        """Resolves how to generate a column's values from its name and type."""
         name, col_type = column["name"].lower(), column["type"].split()[0]
         length, precision = column["length"], column["precision"]
 
         # Heuristics for realistic data
-        if "city" in name:
-            return self.fake.city()[: length or 20]
-        if "state" in name:
-            return self.fake.state_abbr()
-        if "zip" in name or "postal" in name:
-            return self.fake.zipcode()[: length or 9]
-        if "phone" in name:
-            return self.fake.phone_number()[: length or 16]
-        if "first" in name:
-            return self.fake.first_name()[: length or 40]
-        if "last" in name:
-            return self.fake.last_name()[: length or 40]
-        if "email" in name:
-            return self.fake.email()[: length or 40]
+        for substrings, method, default_len in _NAME_HEURISTICS:
+            if any(sub in name for sub in substrings):
+                return "faker", (method, length or default_len)
         # Type-based generation
         if col_type in ["varchar", "char", "text", "bpchar"]:
-            if length <= 2:
-                return self.fake.lexify(text="x" * (length or 1)).upper()
-            return self.fake.text(max_nb_chars=length or 30)
+            if length is not None and length <= 2:
+                return "letters", (length or 1,)
+            return "text", (length or 30,)
         if col_type in ["smallint", "int2"]:
-            return random.randint(-32768, 32767)
+            return "int", (-32768, 32767)
         if col_type in ["int", "integer", "bigint", "int4", "int8"]:
-            return random.randint(1, 1000000)
+            return "int", (1, 1000000)
         if col_type in ["decimal", "numeric"]:
             if precision:
                 max_val = (10 ** (precision[0] - precision[1])) - 1
-                return round(random.uniform(0, max_val), precision[1])
-            return round(random.uniform(0, 1000), 2)
+                return "decimal", (max_val, precision[1])
+            return "decimal", (1000, 2)
         if col_type in ["timestamp", "timestamptz", "date"]:
-            return self.fake.date_time_between(start_date="-5y", end_date="now")
-        if col_type == "boolean":
-            return self.fake.boolean()
-        return None
+            return "timestamp", ()
+        if col_type in ["boolean", "bool"]:
+            return "bool", ()
+        return "null", ()
+
+    def _get_faker_pool(self, method: str) -> List[str]:
+        """Returns the pool of pre-generated values for a Faker method."""
+        pool = self._faker_pools.get(method)
+        if pool is None:
+            gen = getattr(self.fake, method)
+            pool = [gen() for _ in range(FAKER_POOL_SIZE)]
+            self._faker_pools[method] = pool
+        return pool
+
+    def _generate_values(self, plan: ColumnPlan, n: int) -> List[Any]:
+        """Generates n values for a column plan."""
+        kind, params = plan
+        if kind == "int":
+            low, high = params
+            return self._rng.integers(low, high, size=n, endpoint=True).tolist()
+        if kind == "decimal":
+            max_val, scale = params
+            return self._rng.uniform(0, max_val, size=n).round(scale).tolist()
+        if kind == "bool":
+            return (self._rng.random(n) < 0.5).tolist()
+        if kind == "faker":
+            method, max_len = params
+            pool = self._get_faker_pool(method)
+            indices = self._rng.integers(0, len(pool), size=n).tolist()
+            return [pool[i][:max_len] for i in indices]
+        if kind == "letters":
+            (length,) = params
+            return [
+                self.fake.lexify(text="x" * length).upper() for _ in range(n)
+            ]
+        if kind == "text":
+            (max_chars,) = params
+            return [self.fake.text(max_nb_chars=max_chars) for _ in range(n)]
+        if kind == "timestamp":
+            # Uniform over the last 5 years, at second resolution
+            end = np.datetime64(datetime.now(), "s")
+            offsets = self._rng.integers(0, TIMESTAMP_RANGE_SECONDS, size=n)
+            return (end - offsets.astype("timedelta64[s]")).tolist()
+        return [None] * n
+
+    def generate_batch(self, n: int) -> Dict[str, List[Any]]:
+        """
+        Generates n rows as a mapping from column name to a list of n values.
+        Numeric columns are generated with one vectorized call per column.
+        """
+        return {
+            col: self._generate_values(plan, n)
+            for col, plan in self._column_plan.items()
+        }
+
+    def generate_value(self, column_name: str) -> Any:
+        """Generates a single fake value based on column type and name."""
+        return self._generate_values(self._column_plan[column_name], 1)[0]
 
     def generate_row(self) -> Dict[str, Any]:
         """Generates a dictionary representing one row."""
-        return {col: self.generate_value(col) for col in self.columns.keys()}
+        batch = self.generate_batch(1)
+        return {col: values[0] for col, values in batch.items()}
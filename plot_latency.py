@@ -24,19 +24,27 @@ OP_TYPE_NAMES = {
     6: "COMMIT",
 }
 
+# Columns of the benchmark results needed to compute latency per key.
+COLUMNS = ["op_type", "num_keys_touched", "latency"]
+
 
 def load_benchmark_data(parquet_path: str) -> pd.DataFrame:
     """Load benchmark results from parquet file."""
-    df = pd.read_parquet(parquet_path)
-    # Map op_type enum to string names
-    df["op_type"] = (
-        df["op_type"].map(OP_TYPE_NAMES).fillna(df["op_type"].astype(str))
+    # Only decode the columns we use, the sql_query column can be large.
+    df = pd.read_parquet(parquet_path, columns=COLUMNS)
+    # Map op_type enum to string names, using the code itself for unknown ones
+    codes = df["op_type"].to_numpy()
+    size = int(codes.max(initial=max(OP_TYPE_NAMES))) + 1
+    names = np.array(
+        [OP_TYPE_NAMES.get(i, str(i)) for i in range(size)], dtype=object
     )
+    op_types = names[codes]
     # Separate UPDATE into UPDATE (single key) and RANGE_UPDATE (multiple keys)
-    df.loc[
-        (df["op_type"] == "UPDATE") & (df["num_keys_touched"] > 1),
-        "op_type",
-    ] = "RANGE_UPDATE"
+    is_range_update = (op_types == "UPDATE") & (
+        df["num_keys_touched"].to_numpy() > 1
+    )
+    op_types = np.where(is_range_update, "RANGE_UPDATE", op_types)
+    df["op_type"] = pd.Categorical(op_types)
     return df
 
 
@@ -53,20 +61,34 @@ def calculate_per_key_latency(df: pd.DataFrame) -> pd.DataFrame:
 
 def calculate_ci95_by_operation(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate mean and 95% confidence interval for each operation type."""
+    codes, op_types = pd.factorize(df["op_type"], sort=True)
+    latency = df["per_key_latency"].to_numpy(dtype=float)
+    num_ops = len(op_types)
+
+    # Per-operation sums computed in one vectorized pass over the rows
+    count = np.bincount(codes, minlength=num_ops)
+    mean = np.bincount(codes, weights=latency, minlength=num_ops) / count
+    sq_dev = np.bincount(
+        codes, weights=(latency - mean[codes]) ** 2, minlength=num_ops
+    )
+
+    # Sample standard deviation, undefined for a single sample
+    has_dof = count > 1
+    dof = np.maximum(count - 1, 1)
+    std = np.where(has_dof, np.sqrt(sq_dev / dof), np.nan)
+    # 95% CI using t-distribution, from the standard error of the mean
+    ci = np.where(
+        has_dof, std / np.sqrt(count) * stats.t.ppf(0.975, dof), 0.0
+    )
 
-    def ci95(x):
-        n = len(x)
-        if n < 2:
-            return 0
-        se = stats.sem(x)  # Standard error of the mean
-        ci = se * stats.t.ppf(0.975, n - 1)  # 95% CI using t-distribution
-        return ci
-
-    ci_stats = (
-        df.groupby("op_type")["per_key_latency"]
-        .agg(["mean", "std", "count", ci95])
-        .reset_index()
-        .rename(columns={"mean": "mean_latency", "ci95": "ci_95"})
+    ci_stats = pd.DataFrame(
+        {
+            "op_type": np.asarray(op_types),
+            "mean_latency": mean,
+            "std": std,
+            "count": count,
+            "ci_95": ci,
+        }
     )
     return ci_stats
 
@@ -167,7 +189,7 @@ def main():
 
         print("\n=== Summary Statistics ===")
         summary = (
-            df.groupby("op_type")
+            df.groupby("op_type", observed=True)
             .agg(
                 count=("per_key_latency", "count"),
                 mean=("per_key_latency", "mean"),
@@ -6,8 +6,35 @@ that work with any psycopg2 connection.
 """
 
 from typing import Optional
+import weakref
 import psycopg2
 
+# Primary key columns by table name, for each open connection. The schema of a
+# table doesn't change during a benchmark run.
+_pk_columns_cache = weakref.WeakKeyDictionary()
+# Autocommit connections whose search_path has already been set to the public
+# schema.
+_public_search_path_conns = weakref.WeakSet()
+# Cursor reused by the helpers for each connection. This is a plain dict since
+# a cursor references its connection, entries are dropped once the connection
+# is closed.
+_helper_cursors = {}
+
+
+def _get_helper_cursor(
+    conn: psycopg2.extensions.connection,
+) -> psycopg2.extensions.cursor:
+    """
+    Get the cursor shared by the helpers for a connection, creating it if
+    needed.
+    """
+    cur = _helper_cursors.get(conn)
+    if cur is None or cur.closed:
+        for closed_conn in [c for c in _helper_cursors if c.closed]:
+            del _helper_cursors[closed_conn]
+        cur = _helper_cursors[conn] = conn.cursor()
+    return cur
+
 
 def _run_sql_query(
     conn: psycopg2.extensions.connection, query: str, params: tuple = None
@@ -27,17 +54,30 @@ def _run_sql_query(
         Exception: If query execution fails
     """
     try:
-        with conn.cursor() as cur:
-            cur.execute(query, params)
-            try:
-                return cur.fetchall()
-            except psycopg2.ProgrammingError:
-                # No results to fetch (e.g., for INSERT/UPDATE statements)
-                return []
+        cur = _get_helper_cursor(conn)
+        cur.execute(query, params)
+        try:
+            return cur.fetchall()
+        except psycopg2.ProgrammingError:
+            # No results to fetch (e.g., for INSERT/UPDATE statements)
+            return []
     except Exception as e:
         raise Exception(f"Error executing SQL query: {query}; {params}; {e}")
 
 
+def _ensure_public_search_path(conn: psycopg2.extensions.connection) -> None:
+    """
+    Set the search_path of a connection to the public schema. On autocommit
+    connections this is done once per connection. Otherwise the SET is part
+    of the current transaction and undone by a rollback, so it's issued on
+    every call.
+    """
+    if conn not in _public_search_path_conns:
+        _run_sql_query(conn, "SET search_path TO public")
+        if conn.autocommit:
+            _public_search_path_conns.add(conn)
+
+
 def initialize_schema(
     conn: psycopg2.extensions.connection, schema_ddl: str
 ) -> None:
@@ -49,12 +89,11 @@ def initialize_schema(
         schema_ddl: DDL statements separated by semicolons
     """
     print("Initializing database schema...")
-    sql_statements = [
-        stmt.strip() for stmt in schema_ddl.split(";") if stmt.strip()
-    ]
-    with conn.cursor() as cur:
-        for stmt in sql_statements:
-            cur.execute(stmt)
+    if schema_ddl.strip():
+        # Send all statements in a single round-trip, the server runs them in
+        # order and stops at the first error.
+        with conn.cursor() as cur:
+            cur.execute(schema_ddl)
 
     conn.commit()
 
@@ -63,7 +102,8 @@ def _get_primary_key_columns(
     conn: psycopg2.extensions.connection, table_name: str
 ) -> list[tuple[str, int]]:
     """
-    Get the primary key columns for a table.
+    Get the primary key columns for a table. Results are cached per
+    connection.
 
     Args:
         conn: Active psycopg2 connection
@@ -72,25 +112,28 @@ def _get_primary_key_columns(
     Returns:
         List of (column_name, ordinal_position) tuples
     """
+    cache = _pk_columns_cache.setdefault(conn, {})
+    if table_name in cache:
+        return cache[table_name]
+
+    # Read the catalogs directly, the information_schema views are much slower.
     query = """
-        SELECT 
-            column_name, ordinal_position
-        FROM 
-            information_schema.key_column_usage
-        WHERE 
-            table_schema = 'public'
-            AND table_name = %s
-            AND constraint_name = (
-                SELECT constraint_name
-                FROM information_schema.table_constraints
-                WHERE table_schema = 'public'
-                AND table_name = %s
-                AND constraint_type = 'PRIMARY KEY'
-            )
-        ORDER BY ordinal_position DESC;
-    """
-    pk_columns = _run_sql_query(conn, query, (table_name, table_name))
-    return [(col[0], col[1]) for col in pk_columns]
+        SELECT
+            a.attname, k.ordinal_position
+        FROM
+            pg_index i
+            CROSS JOIN LATERAL unnest(i.indkey)
+                WITH ORDINALITY AS k(attnum, ordinal_position)
+            JOIN pg_attribute a
+                ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+        WHERE
+            i.indrelid = to_regclass(format('public.%%I', %s))
+            AND i.indisprimary
+        ORDER BY k.ordinal_position DESC;
+    """
+    pk_columns = _run_sql_query(conn, query, (table_name,))
+    cache[table_name] = [(col[0], col[1]) for col in pk_columns]
+    return cache[table_name]
 
 
 def get_pk_column_names(
@@ -137,7 +180,7 @@ def get_pk_values(
     if not pk_columns:
         pk_columns = get_pk_column_names(conn, table_name)
     # Ensure we're using the public schema
-    _run_sql_query(conn, "SET search_path TO public")
+    _ensure_public_search_path(conn)
 
     sql = f"SELECT {', '.join(pk_columns)} FROM {table_name};"
     all_pks = _run_sql_query(conn, sql)
@@ -155,7 +198,6 @@ def get_all_tables(conn: psycopg2.extensions.connection) -> list[str]:
     Returns:
         List of table names
     """
-    _run_sql_query(conn, "SET search_path TO public")
     query = """
     SELECT table_name
     FROM information_schema.tables
@@ -181,8 +223,6 @@ def get_db_size(conn: psycopg2.extensions.connection) -> int:
     db_name_result = _run_sql_query(conn, db_name_query)
     db_name = db_name_result[0][0] if db_name_result else None
 
-    _run_sql_query(conn, "SET search_path TO public")
-
     if not db_name:
         print("Warning: Could not determine database name, returning 0")
         return 0
@@ -210,7 +250,6 @@ def get_all_columns(
     Returns:
         List of column names
     """
-    _run_sql_query(conn, "SET search_path TO public")
     query = """
     SELECT column_name
     FROM information_schema.columns
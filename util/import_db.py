@@ -1,9 +1,51 @@
 import argparse
+import os
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 from typing import Union
 
+# Suffixes of pg_dump archive files, which are loaded with pg_restore.
+DUMP_ARCHIVE_SUFFIXES = (".dump", ".custom")
+
+
+def _restore_dump_archive(
+    connection_uri: str, dump_file_path: Path, verbose: bool
+) -> None:
+    """
+    Restores a pg_dump archive with pg_restore, loading tables in parallel.
+    """
+    cmd = [
+        "pg_restore",
+        "--exit-on-error",
+        "-j",
+        str(os.cpu_count() or 1),
+        "-d",
+        connection_uri,
+    ]
+    if verbose:
+        cmd.append("-v")
+    cmd.append(str(dump_file_path))
+
+    try:
+        # In verbose mode pg_restore's progress goes straight to our stderr
+        result = subprocess.run(
+            cmd, stderr=None if verbose else subprocess.PIPE, text=True
+        )
+    except FileNotFoundError:
+        raise RuntimeError(
+            "pg_restore command not found. Please ensure PostgreSQL client is installed."
+        )
+
+    if result.returncode != 0:
+        stderr = result.stderr or ""
+        print(f"✗ Error restoring dump file: {stderr}", file=sys.stderr)
+        raise RuntimeError(f"pg_restore failed: {stderr}")
+
+    if verbose:
+        print(f"✓ Successfully restored dump file: {dump_file_path}")
+
 
 def load_sql_file(
     connection_uri: str,
@@ -15,6 +57,8 @@ def load_sql_file(
 
     Uses the psql command-line tool to properly handle psql meta-commands
     like \\set, \\connect, \\restrict, etc. that psycopg2 cannot execute.
+    The file runs in a single transaction. pg_dump archives (.dump, .custom)
+    are loaded with a parallel pg_restore instead.
 
     Args:
         connection_uri: PostgreSQL connection URI string
@@ -30,6 +74,12 @@ def load_sql_file(
     if not sql_file_path.exists():
         raise FileNotFoundError(f"SQL file not found: {sql_file_path}")
 
+    if sql_file_path.suffix in DUMP_ARCHIVE_SUFFIXES:
+        if verbose:
+            print(f"Restoring dump file via pg_restore: {sql_file_path}")
+        _restore_dump_archive(connection_uri, sql_file_path, verbose)
+        return
+
     if verbose:
         print(f"Loading SQL file via psql: {sql_file_path}")
 
@@ -40,6 +90,11 @@ def load_sql_file(
         connection_uri,
         "-v",
         "ON_ERROR_STOP=1",  # Stop on first error
+        # Run the whole script read from stdin as one transaction, so there's
+        # a single commit instead of one per statement.
+        "--single-transaction",
+        "-f",
+        "-",
     ]
 
     if verbose:
@@ -48,45 +103,45 @@ def load_sql_file(
         cmd.append("-q")  # Quiet mode
 
     try:
-        # Use Popen for real-time output streaming
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,  # Line buffered
-        )
-
-        try:
-            with sql_file_path.open("r", encoding="utf-8") as sql_file:
-                for line in sql_file:
-                    stripped = line.lstrip()
-                    if stripped.startswith("\\restrict") or stripped.startswith(
-                        "\\unrestrict"
-                    ):
-                        continue
-                    process.stdin.write(line)
-        except BrokenPipeError:
-            # psql already exited (likely due to earlier failure); we'll handle
-            # the error when checking returncode below.
-            pass
-        finally:
-            if process.stdin:
-                process.stdin.close()
-
-        # Stream stdout in real-time
-        if verbose:
-            for line in process.stdout:
-                print(line, end="")
-
-        # Wait for completion and get return code
-        process.wait()
+        # psql's output isn't read while the script is being written to its
+        # stdin, so it must not go to a pipe that could fill up and block
+        # psql. In verbose mode stdout goes straight to ours, and stderr is
+        # spooled to a temporary file so that it can be reported on failure.
+        with tempfile.TemporaryFile(mode="w+") as stderr_file:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=None if verbose else subprocess.DEVNULL,
+                stderr=stderr_file,
+                text=True,
+                bufsize=1 if verbose else -1,  # Line buffered when streaming
+            )
 
-        if process.returncode != 0:
-            stderr = process.stderr.read()
-            print(f"✗ Error executing SQL file: {stderr}", file=sys.stderr)
-            raise RuntimeError(f"psql failed: {stderr}")
+            try:
+                with sql_file_path.open("r", encoding="utf-8") as sql_file:
+                    for line in sql_file:
+                        stripped = line.lstrip()
+                        if stripped.startswith(
+                            "\\restrict"
+                        ) or stripped.startswith("\\unrestrict"):
+                            continue
+                        process.stdin.write(line)
+            except BrokenPipeError:
+                # psql already exited (likely due to earlier failure); we'll
+                # handle the error when checking returncode below.
+                pass
+            finally:
+                if process.stdin:
+                    process.stdin.close()
+
+            # Wait for completion and get return code
+            process.wait()
+
+            if process.returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+                print(f"✗ Error executing SQL file: {stderr}", file=sys.stderr)
+                raise RuntimeError(f"psql failed: {stderr}")
 
         if verbose:
             print(f"✓ Successfully executed SQL file: {sql_file_path}")
@@ -6,6 +6,65 @@ of any specific application logic. Use these utilities to extract structural
 information from SQL statements.
 """
 
+import functools
+import re
+import sys
+from typing import Iterable, List, Optional, Tuple
+
+# Statements at least this long aren't cached, so that large one-off SQL isn't
+# kept alive by the cache.
+MAX_CACHED_SQL_LENGTH = 8192
+
+# Keywords of the statements that can be recognized from their first word.
+_MAIN_KEYWORDS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+# Interned copies of the keywords most often returned, so that the same string
+# object is handed back every time and callers' comparisons are cheap.
+_INTERNED_KEYWORDS = {
+    keyword: sys.intern(keyword)
+    for keyword in (
+        "SELECT",
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "WITH",
+        "CREATE",
+        "DROP",
+        "ALTER",
+        "MERGE",
+        "TRUNCATE",
+        "",
+    )
+}
+
+# Leading whitespace, opening parentheses and comments, then the first word.
+_LEADING_KEYWORD_RE = re.compile(
+    r"(?:[\s(]+|--[^\n]*|/\*.*?(?:\*/|\Z))*(\w*)", re.DOTALL
+)
+# Leading whitespace and opening parentheses, then the first word.
+_FIRST_KEYWORD_RE = re.compile(r"[\s(]*(\w*)")
+
+# Limits on how much of a CTE query is scanned for its main statement. Past
+# these, the query is reported as a plain WITH rather than being parsed
+# further.
+MAX_CTE_DEPTH = 64
+MAX_CTE_SCAN_LENGTH = 1 << 16
+
+# Tokens that matter when looking for the main statement of a CTE query: a
+# quoted string literal (which may run to the end of the input, a backslash
+# escapes the next character), a line or block comment, a parenthesis, a
+# semicolon, or a main statement keyword as a whole word.
+_CTE_TOKEN_RE = re.compile(
+    r"""'(?:\\.|[^'\\])*'?|"(?:\\.|[^"\\])*"?"""
+    r"|--[^\n]*|/\*.*?(?:\*/|\Z)"
+    r"|[();]"
+    r"|\b(?P<keyword>SELECT|INSERT|UPDATE|DELETE)\b",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# The (statement, keyword) pair of the last get_sql_operation_keyword call.
+_last_call: Tuple[Optional[str], str] = (None, "")
+
 
 def get_sql_operation_keyword(sql: str) -> str:
     """
@@ -32,117 +91,143 @@ def get_sql_operation_keyword(sql: str) -> str:
         >>> get_sql_operation_keyword("-- comment\\nINSERT INTO users VALUES (1)")
         "INSERT"
     """
-    if not sql or not sql.strip():
+    global _last_call
+    if not sql:
         return ""
+    # The same statement is often run many times in a row, so the last call
+    # is checked before the cache. The slot is replaced as a whole tuple,
+    # which keeps it consistent across threads.
+    last_sql, last_keyword = _last_call
+    if sql is last_sql or sql == last_sql:
+        return last_keyword
+    # Results are cached, since the same statements are usually seen many times
+    if len(sql) < MAX_CACHED_SQL_LENGTH:
+        keyword = _get_sql_operation_keyword_cached(sql)
+    else:
+        keyword = _get_sql_operation_keyword(sql)
+    _last_call = (sql, keyword)
+    return keyword
+
+
+def get_sql_operation_keywords(sqls: Iterable[str]) -> List[str]:
+    """
+    Extract the primary SQL operation keyword from each of many statements.
 
-    # Remove SQL comments
-    sql_clean = _remove_sql_comments(sql)
+    Equivalent to calling get_sql_operation_keyword on every statement, with
+    less per-statement overhead.
 
-    # Split by semicolons to handle multiple statements (take first)
-    statements = sql_clean.split(";")
-    if statements:
-        sql_clean = statements[0].strip()
+    Args:
+        sqls: SQL statements to analyze
 
-    if not sql_clean:
-        return ""
+    Returns:
+        The primary operation keyword of each statement, in order
+    """
+    cached = _get_sql_operation_keyword_cached
+    uncached = _get_sql_operation_keyword
+    max_cached = MAX_CACHED_SQL_LENGTH
+    keywords = []
+    append = keywords.append
+    for sql in sqls:
+        if not sql:
+            append("")
+        elif len(sql) < max_cached:
+            append(cached(sql))
+        else:
+            append(uncached(sql))
+    return keywords
+
+
+def _get_sql_operation_keyword(sql: str) -> str:
+    """Uncached implementation of get_sql_operation_keyword."""
+    # Fast path for a statement that starts right away with its keyword, which
+    # only needs to look at the first 7 characters.
+    # The keyword must end there, a letter, digit or underscore would make it
+    # part of a longer word.
+    head = sql[:7].upper()
+    if head[:6] in _MAIN_KEYWORDS and not (
+        head[6:].isalnum() or head[6:] == "_"
+    ):
+        return _INTERNED_KEYWORDS[head[:6]]
+
+    # The leading keyword decides the operation, unless it's a CTE
+    keyword = _scan_leading_keyword(sql)
+    if keyword != "WITH":
+        return keyword
 
     # Handle CTEs: WITH clause comes before the main query
-    if sql_clean.upper().lstrip().startswith("WITH"):
-        main_stmt = _extract_main_statement_after_cte(sql_clean)
-        if main_stmt:
-            sql_clean = main_stmt
+    return _find_cte_main_keyword(sql)
 
-    # Get the first significant keyword
-    return get_first_keyword(sql_clean)
 
+_get_sql_operation_keyword_cached = functools.lru_cache(maxsize=4096)(
+    _get_sql_operation_keyword
+)
 
-def _remove_sql_comments(sql: str) -> str:
+
+def _scan_leading_keyword(sql: str) -> str:
     """
-    Remove SQL comments (-- and /* */) from a SQL string.
+    Extract the first keyword of a SQL string in a single forward scan.
 
-    Preserves string literals - comments inside quotes are not removed.
+    Skips leading whitespace, opening parentheses and comments (-- and /* */),
+    then reads the word that follows. Only the start of the string
+    is looked at, the rest of the statement is never copied. An unterminated
+    comment leaves no keyword.
 
     Args:
-        sql: SQL statement potentially containing comments
+        sql: SQL statement to analyze
 
     Returns:
-        SQL statement with comments removed
+        First keyword in uppercase, or empty string if none found
     """
-    result = []
-    i = 0
-    in_string = False
-    string_char = None
-
-    while i < len(sql):
-        # Handle string literals (don't process comments inside strings)
-        if not in_string and sql[i] in ('"', "'"):
-            in_string = True
-            string_char = sql[i]
-            result.append(sql[i])
-            i += 1
-        elif in_string:
-            result.append(sql[i])
-            if sql[i] == string_char and (i == 0 or sql[i - 1] != "\\"):
-                in_string = False
-            i += 1
-        # Handle -- comments
-        elif sql[i : i + 2] == "--":
-            # Skip until end of line
-            while i < len(sql) and sql[i] != "\n":
-                i += 1
-            if i < len(sql):
-                result.append("\n")  # Keep the newline
-                i += 1
-        # Handle /* */ comments
-        elif sql[i : i + 2] == "/*":
-            # Skip until */
-            i += 2
-            while i < len(sql) - 1:
-                if sql[i : i + 2] == "*/":
-                    i += 2
-                    break
-                i += 1
-        else:
-            result.append(sql[i])
-            i += 1
-
-    return "".join(result)
+    # The whitespace, parentheses and comments before the keyword are skipped
+    # in runs inside the regex engine, rather than one character at a time.
+    keyword = _LEADING_KEYWORD_RE.match(sql).group(1).upper()
+    return _INTERNED_KEYWORDS.get(keyword, keyword)
 
 
-def _extract_main_statement_after_cte(sql: str) -> str:
+def _find_cte_main_keyword(
+    sql: str,
+    max_depth: int = MAX_CTE_DEPTH,
+    max_length: int = MAX_CTE_SCAN_LENGTH,
+) -> str:
     """
-    Extract the main statement after CTE (WITH clause) definitions.
+    Extract the keyword of the main statement of a CTE (WITH) query.
 
-    For queries with CTEs, this function returns the primary SELECT/INSERT/UPDATE/DELETE
-    statement that follows the CTE definitions.
+    Makes a single pass over the tokens of the first statement, skipping
+    string literals and comments, and returns the first SELECT, INSERT,
+    UPDATE or DELETE found outside of all parentheses. Scanning gives up on
+    parentheses nested deeper than max_depth, and after the first max_length
+    characters.
 
     Example:
-        >>> extract_main_statement_after_cte("WITH cte AS (SELECT * FROM t) SELECT * FROM cte")
-        "SELECT * FROM cte"
+        >>> _find_cte_main_keyword("WITH cte AS (SELECT * FROM t) SELECT * FROM cte")
+        "SELECT"
 
     Args:
-        sql: SQL statement potentially containing CTEs
+        sql: SQL statement starting with a WITH clause
+        max_depth: Maximum parenthesis nesting depth to scan through
+        max_length: Maximum number of characters to scan
 
     Returns:
-        Main statement after CTE definitions, or original SQL if no CTEs found
+        The main statement keyword in uppercase, or "WITH" if none is found
     """
-    # Find the main statement keyword at depth 0 (outside of all parentheses)
     depth = 0
-
-    for i, char in enumerate(sql):
-        if char == "(":
+    for token in _CTE_TOKEN_RE.finditer(sql, 0, max_length):
+        keyword = token.group("keyword")
+        if keyword:
+            if depth == 0:
+                keyword = keyword.upper()
+                return _INTERNED_KEYWORDS.get(keyword, keyword)
+        elif token.group() == "(":
             depth += 1
-        elif char == ")":
+            if depth > max_depth:
+                break
+        elif token.group() == ")":
             depth -= 1
-        elif depth == 0 and char not in (" ", "\t", "\n", ","):
-            # We're at depth 0 and hit a non-whitespace, non-comma character
-            # Check if this starts a main statement keyword
-            remaining = sql[i:].lstrip().upper()
-            if remaining.startswith(("SELECT", "INSERT", "UPDATE", "DELETE")):
-                return sql[i:].lstrip()
+        elif token.group() == ";":
+            # Only the first statement is considered
+            break
 
-    # Fallback: return original if we can't parse it
-    return sql
+    return "WITH"
 
 
 def get_first_keyword(sql: str) -> str:
@@ -163,14 +248,8 @@ def get_first_keyword(sql: str) -> str:
         >>> get_first_keyword("  INSERT INTO users VALUES (1)")
         "INSERT"
     """
-    # Split by whitespace and get first non-empty token
-    tokens = sql.strip().split()
-    if not tokens:
-        return ""
-
-    first_token = tokens[0].upper()
-
-    # Remove parentheses if present
-    first_token = first_token.lstrip("(").rstrip(")")
-
-    return first_token
+    # Skip whitespace and opening parentheses, then take the word.
+    # Unlike split(), this stops at the first word rather than scanning and
+    # copying the whole string.
+    keyword = _FIRST_KEYWORD_RE.match(sql).group(1).upper()
+    return _INTERNED_KEYWORDS.get(keyword, keyword)